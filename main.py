@@ -1,46 +1,56 @@
+from collections import deque
 from enum import Enum
 from itertools import chain
+import json
+from typing import Any, Dict, Tuple
 
-import pygame
-from pygame import Color
 from mazes.mazemap import MazeMap
 from mazes.mazecell import MazeCell
-from mazes.mazegen import MAZE
-from mazes.mazesolver import SOLVER
+from mazes.registry import MAZE, SOLVER
+from mazes.mazecache import MazeCache, cache_key, replay
 import click
 
-@click.command()
+
+def generate_headless(maze: str, num_rows: int, num_cols: int, seed: int) -> MazeMap:
+    """ Run a maze generator to completion without rendering
+    """
+    maze_map = MazeMap(num_rows, num_cols, None)
+    deque(MAZE[maze](maze_map, seed), maxlen=0)
+    return maze_map
+
+
+@click.group(invoke_without_command=True)
 @click.option(
     "--maze",
     "-m",
     type=str,
     default="prims",
-    help=f"Maze type from {list(MAZE.keys())}"
+    help=f"Maze type from {MAZE.builtins} or an '{MAZE.group}' entry point"
 )
 @click.option(
     "--solver",
     "-s",
     type=str,
     default="astar",
-    help=f"Path solver from {list(SOLVER.keys())}"
+    help=f"Path solver from {SOLVER.builtins} or an '{SOLVER.group}' entry point"
 )
 @click.option(
     "--num_rows",
     "-r",
-    type=int,
+    type=click.IntRange(min=1),
     default=100
 )
 @click.option(
     "--num_cols",
     "-c",
-    type=int,
+    type=click.IntRange(min=1),
     default=100
 )
 @click.option(
     "--seed",
     type=int,
     default=42,
-    help="Random seed for maze generation"
+    help="Random seed for maze generation, the first of --count seeds for analyze"
 )
 @click.option(
     "--tick",
@@ -48,14 +58,53 @@ import click
     default=3000,
     help="Tick rate. Higher means faster maze generation"
 )
+@click.option(
+    "--cache_dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Maze cache directory. Defaults to $AMAZE_CACHE_DIR or ~/.cache/amaze"
+)
+@click.option(
+    "--no_cache",
+    is_flag=True,
+    help="Always regenerate mazes instead of reading or writing the cache"
+)
+@click.pass_context
 def main(
+    ctx,
     maze,
     solver,
     num_rows: int,
     num_cols: int,
     seed: int,
-    tick: int
+    tick: int,
+    cache_dir: str,
+    no_cache: bool
 ):
+    if maze not in MAZE:
+        raise click.BadParameter(
+            f"'{maze}' is not one of {MAZE.builtins} or an '{MAZE.group}' entry point",
+            param_hint="--maze"
+        )
+    cache = None if no_cache else MazeCache(cache_dir)
+    if ctx.invoked_subcommand is not None:
+        # Subcommands share the maze options given before them
+        ctx.obj = {
+            "maze": maze,
+            "num_rows": num_rows,
+            "num_cols": num_cols,
+            "seed": seed,
+            "cache": cache
+        }
+        return
+    if solver not in SOLVER:
+        raise click.BadParameter(
+            f"'{solver}' is not one of {SOLVER.builtins} or an '{SOLVER.group}' entry point",
+            param_hint="--solver"
+        )
+    # Only the interactive window needs pygame
+    import pygame
+    from pygame import Color
     pygame.init()
 
     scale = MazeCell.TILE_HEIGHT
@@ -67,9 +116,20 @@ def main(
     exit = False
     maze_map = MazeMap(num_rows, num_cols, canvas)
     maze_map.draw()
-    maze_gen = MAZE[maze](maze_map, seed)
+    maze_gen = replay(
+        cache,
+        cache_key(maze, num_rows, num_cols, seed),
+        maze_map,
+        MAZE[maze](maze_map, seed)
+    )
     maze_solver = SOLVER[solver](maze_map, maze_map.cells[0][0], maze_map.cells[-1][-1])
-    chain_gen = chain(maze_gen, maze_solver)
+    # A cached solution already contains the maze, so generation is skipped as well
+    chain_gen = replay(
+        cache,
+        cache_key(maze, num_rows, num_cols, seed, solver),
+        maze_map,
+        chain(maze_gen, maze_solver)
+    )
     while not exit:
         try:
             next(chain_gen)
@@ -81,7 +141,75 @@ def main(
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 exit = True
-        
+
+
+@main.command()
+@click.option(
+    "--count",
+    "-n",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of mazes to analyze, using consecutive seeds"
+)
+@click.option(
+    "--batch_size",
+    type=click.IntRange(min=1),
+    default=256,
+    help="Number of mazes scored per vectorized pass"
+)
+@click.option(
+    "--start",
+    type=(int, int),
+    default=(0, 0),
+    help="Row and column the solution starts from, negative values count from the end"
+)
+@click.option(
+    "--end",
+    type=(int, int),
+    default=(-1, -1),
+    help="Row and column the solution ends at, negative values count from the end"
+)
+@click.pass_obj
+def analyze(
+    options: Dict[str, Any],
+    count: int,
+    batch_size: int,
+    start: Tuple[int, int],
+    end: Tuple[int, int]
+):
+    """ Print connectivity, dead end, junction, corridor and path metrics as JSON Lines
+
+    One JSON object per maze is written as soon as its batch has been scored.
+
+    Mazes are configured by the options before the subcommand, e.g.
+
+    \b
+    python main.py -m dfs -r 20 -c 20 analyze -n 100
+    """
+    maze, num_rows, num_cols, seed = options["maze"], options["num_rows"], options["num_cols"], options["seed"]
+    for name, (row, col) in (("--start", start), ("--end", end)):
+        if not (-num_rows <= row < num_rows and -num_cols <= col < num_cols):
+            raise click.BadParameter(f"({row}, {col}) is outside a {num_rows}x{num_cols} maze", param_hint=name)
+
+    import numpy as np
+    from mazes.mazeanalytics import analyze_tiles, stats_to_records
+
+    cache = options["cache"]
+    for batch_seed in range(seed, seed + count, batch_size):
+        seeds = range(batch_seed, min(batch_seed + batch_size, seed + count))
+        tiles = []
+        for s in seeds:
+            key = cache_key(maze, num_rows, num_cols, s) if cache is not None else None
+            tile_states = cache.load(key) if key is not None else None
+            if tile_states is None:
+                tile_states = generate_headless(maze, num_rows, num_cols, s).tile_states()
+                if key is not None:
+                    cache.store(key, tile_states)
+            tiles.append(tile_states)
+        stats = analyze_tiles(np.array(tiles, dtype=np.uint8), start, end)
+        for s, record in zip(seeds, stats_to_records(stats)):
+            click.echo(json.dumps({"maze": maze, "num_rows": num_rows, "num_cols": num_cols, "seed": s, **record}))
+
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,225 @@
+""" Vectorized maze analytics
+
+Every maze is reduced to two boolean arrays of open walls:
+`east[..., r, c]` is open between cells (r, c) and (r, c+1), and
+`south[..., r, c]` is open between cells (r, c) and (r+1, c).
+A leading batch axis is always present so that thousands of mazes
+can be scored with the same handful of numpy passes.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from mazes.mazemap import MazeMap
+from mazes.mazecell import TileState
+
+
+def walls_from_tiles(tiles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ Extract open east/south walls from (batch, 3*rows, 3*cols) tile grids
+
+    A wall counts as open only when it has been cleared on both sides,
+    the same rule used by MazeMap.query_connected
+    """
+    wall = TileState.WALL_STATE.value
+    tiles = np.asarray(tiles)
+    if tiles.ndim == 2:
+        tiles = tiles[np.newaxis]
+    east = (tiles[:, 1::3, 2::3][:, :, :-1] != wall) & (tiles[:, 1::3, 0::3][:, :, 1:] != wall)
+    south = (tiles[:, 2::3, 1::3][:, :-1, :] != wall) & (tiles[:, 0::3, 1::3][:, 1:, :] != wall)
+    return east, south
+
+
+def walls_from_maze_maps(maze_maps: Sequence[MazeMap]) -> Tuple[np.ndarray, np.ndarray]:
+    """ Stack equally sized MazeMaps into batched east/south wall arrays
+    """
+    shapes = {(m.num_rows, m.num_columns) for m in maze_maps}
+    if len(shapes) != 1:
+        raise ValueError(f"Expected a non-empty batch of equally sized mazes, got sizes {sorted(shapes)}")
+    tiles = np.array([m.tile_states() for m in maze_maps], dtype=np.uint8)
+    return walls_from_tiles(tiles)
+
+
+def _neighbors(east: np.ndarray, south: np.ndarray) -> np.ndarray:
+    """ Build a (batch*rows*cols, 4) table of neighbor ids, -1 where walled off
+    """
+    batch, rows = south.shape[0], east.shape[1]
+    cols = east.shape[2] + 1
+    ids = np.arange(batch * rows * cols, dtype=np.int32).reshape(batch, rows, cols)
+    nbr = np.full((batch, rows, cols, 4), -1, dtype=np.int32)
+    nbr[:, :-1, :, 0] = np.where(south, ids[:, 1:, :], -1)
+    nbr[:, 1:, :, 1] = np.where(south, ids[:, :-1, :], -1)
+    nbr[:, :, :-1, 2] = np.where(east, ids[:, :, 1:], -1)
+    nbr[:, :, 1:, 3] = np.where(east, ids[:, :, :-1], -1)
+    return nbr.reshape(-1, 4)
+
+
+def _edges(east: np.ndarray, south: np.ndarray, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """ List the open walls as (u, v) flat cell ids, optionally only between masked cells
+    """
+    batch, rows = south.shape[0], east.shape[1]
+    cols = east.shape[2] + 1
+    ids = np.arange(batch * rows * cols, dtype=np.int32).reshape(batch, rows, cols)
+    if mask is not None:
+        east = east & mask[:, :, :-1] & mask[:, :, 1:]
+        south = south & mask[:, :-1, :] & mask[:, 1:, :]
+    u_east = ids[:, :, :-1][east]
+    u_south = ids[:, :-1, :][south]
+    return np.concatenate((u_east, u_south)), np.concatenate((u_east + 1, u_south + cols))
+
+
+def _component_labels(num_nodes: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """ Union-find over all edges at once
+
+    Each round hooks the larger root of every edge onto the smaller one,
+    then compresses paths by pointer jumping until every node points at its root
+    """
+    labels = np.arange(num_nodes, dtype=np.int32)
+    while True:
+        lu = labels[u]
+        lv = labels[v]
+        differs = lu != lv
+        if not differs.any():
+            return labels
+        lo = np.minimum(lu[differs], lv[differs])
+        hi = np.maximum(lu[differs], lv[differs])
+        np.minimum.at(labels, hi, lo)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def _distance_field(nbr: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    """ Layer-wise breadth-first search from one source per maze
+
+    Only the frontier is touched on every layer, so a whole batch
+    costs O(cells) work plus one small step per layer of the deepest maze.
+    Unreachable cells keep a distance of -1
+    """
+    dist = np.full(nbr.shape[0], -1, dtype=np.int32)
+    # Scratch space to drop cells reached twice within a layer without sorting
+    owner = np.empty(nbr.shape[0], dtype=np.int32)
+    dist[sources] = 0
+    frontier = sources
+    step = 0
+    while frontier.size:
+        step += 1
+        reached = nbr[frontier].ravel()
+        reached = reached[reached >= 0]
+        reached = reached[dist[reached] < 0]
+        order = np.arange(reached.size, dtype=np.int32)
+        owner[reached] = order
+        reached = reached[owner[reached] == order]
+        dist[reached] = step
+        frontier = reached
+    return dist
+
+
+def analyze_walls(
+    east: np.ndarray,
+    south: np.ndarray,
+    start: Tuple[int, int] = (0, 0),
+    end: Tuple[int, int] = (-1, -1)
+) -> Dict[str, np.ndarray]:
+    """ Score a batch of mazes
+
+    Args:
+        east: (batch, rows, cols-1) open walls between horizontal neighbors
+        south: (batch, rows-1, cols) open walls between vertical neighbors
+        start: (row, col) of the solution start, negative values wrap
+        end: (row, col) of the solution end, negative values wrap
+
+    Returns:
+        A dict of arrays with one entry per maze. `solution_length` is -1 when
+        end is unreachable from start. `diameter` is the longest path within the
+        region reachable from start, exact for acyclic mazes. `corridor_histogram`
+        has shape (batch, longest_corridor+1) and counts maximal runs of cells
+        with exactly two openings by their length in cells.
+    """
+    batch, rows = south.shape[0], east.shape[1]
+    cols = east.shape[2] + 1
+    num_cells = rows * cols
+    offsets = np.arange(batch) * num_cells
+
+    nbr = _neighbors(east, south)
+    degree = (nbr >= 0).sum(axis=1).reshape(batch, rows, cols)
+
+    # Connectivity and cycles from the union-find labelling
+    u, v = _edges(east, south)
+    labels = _component_labels(batch * num_cells, u, v)
+    roots = labels == np.arange(batch * num_cells)
+    num_components = roots.reshape(batch, num_cells).sum(axis=1)
+    num_passages = east.sum(axis=(1, 2)) + south.sum(axis=(1, 2))
+    is_connected = num_components == 1
+    # A forest has exactly one fewer edge than nodes per component
+    is_acyclic = num_passages == num_cells - num_components
+
+    # Corridors are components of the subgraph of degree-2 cells
+    is_corridor = degree == 2
+    u, v = _edges(east, south, is_corridor)
+    corridor_labels = _component_labels(batch * num_cells, u, v)
+    lengths = np.bincount(corridor_labels[is_corridor.ravel()], minlength=batch * num_cells)
+    corridor_roots = np.flatnonzero(lengths)
+    lengths = lengths[corridor_roots]
+    width = int(lengths.max()) + 1 if lengths.size else 1
+    corridor_histogram = np.bincount(
+        (corridor_roots // num_cells) * width + lengths,
+        minlength=batch * width
+    ).reshape(batch, width)
+
+    # Two distance fields: start -> everything, then farthest cell -> everything
+    start_ids = offsets + (start[0] % rows) * cols + (start[1] % cols)
+    end_ids = offsets + (end[0] % rows) * cols + (end[1] % cols)
+    from_start = _distance_field(nbr, start_ids)
+    farthest = offsets + from_start.reshape(batch, num_cells).argmax(axis=1)
+    from_farthest = _distance_field(nbr, farthest)
+
+    return {
+        "is_connected": is_connected,
+        "is_acyclic": is_acyclic,
+        "is_perfect": is_connected & is_acyclic,
+        "num_components": num_components,
+        "dead_ends": (degree == 1).sum(axis=(1, 2)),
+        "junctions": (degree >= 3).sum(axis=(1, 2)),
+        "corridor_histogram": corridor_histogram,
+        "solution_length": from_start[end_ids],
+        "diameter": from_farthest.reshape(batch, num_cells).max(axis=1),
+    }
+
+
+def analyze_tiles(
+    tiles: np.ndarray,
+    start: Tuple[int, int] = (0, 0),
+    end: Tuple[int, int] = (-1, -1)
+) -> Dict[str, np.ndarray]:
+    """ Score a (batch, 3*rows, 3*cols) array of tile grids
+    """
+    east, south = walls_from_tiles(tiles)
+    return analyze_walls(east, south, start, end)
+
+
+def analyze_mazes(
+    maze_maps: Sequence[MazeMap],
+    start: Tuple[int, int] = (0, 0),
+    end: Tuple[int, int] = (-1, -1)
+) -> Dict[str, np.ndarray]:
+    """ Score a batch of equally sized MazeMaps
+    """
+    east, south = walls_from_maze_maps(maze_maps)
+    return analyze_walls(east, south, start, end)
+
+
+def stats_to_records(stats: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """ Split batched stats into one JSON serializable dict per maze
+    """
+    batch = len(stats["diameter"])
+    records = [dict() for _ in range(batch)]
+    for key, values in stats.items():
+        for record, value in zip(records, values.tolist()):
+            if key == "corridor_histogram":
+                # Trim the zero padding shared across the batch
+                while len(value) > 1 and value[-1] == 0:
+                    value.pop()
+            record[key] = value
+    return records
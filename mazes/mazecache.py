@@ -0,0 +1,301 @@
+""" Persistent on-disk cache of finished mazes and solver outputs
+
+Entries are content addressed by (algorithm, rows, cols, seed, code version),
+where the code version hashes the sources that decide what a maze looks like.
+Each entry is the final tile grid of a MazeMap, zlib compressed behind a small header.
+
+Writes go to a temporary file that is atomically renamed into place, so any number
+of processes can share one cache directory. Reads refresh the entry's mtime. Every
+store adds its size to a running tally kept in the directory's lock file, and once
+the tally exceeds the size cap the least recently used entries are evicted.
+The cache is best-effort: filesystem errors are logged once and the caller carries on uncached.
+"""
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional
+import functools
+import hashlib
+import json
+import logging
+import os
+import platform
+import struct
+import sys
+import tempfile
+import time
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from mazes import constants, mazecell, mazemap
+from mazes.mazemap import MazeMap
+from mazes.registry import MAZE, SOLVER
+
+
+MAGIC = b"AMZC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHII")
+SUFFIX = ".maze"
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Temporary files older than this were left behind by crashed writers
+STALE_TMP_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> str:
+    """ $AMAZE_CACHE_DIR, falling back to $XDG_CACHE_HOME/amaze or ~/.cache/amaze
+    """
+    if os.environ.get("AMAZE_CACHE_DIR"):
+        return os.environ["AMAZE_CACHE_DIR"]
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "amaze")
+
+
+@functools.lru_cache(maxsize=None)
+def _source_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def code_version(fn: Callable) -> Optional[str]:
+    """ Hash the module defining a generator or solver along with the tile model
+
+    Returns None when fn has no source file to hash, e.g. a function defined in a REPL
+    """
+    module = sys.modules.get(getattr(fn, "__module__", None) or "")
+    source = getattr(module, "__file__", None)
+    if source is None:
+        return None
+    paths = [source, mazemap.__file__, mazecell.__file__, constants.__file__]
+    try:
+        return hashlib.sha256("".join(_source_digest(p) for p in paths).encode()).hexdigest()
+    except OSError:
+        return None
+
+
+def cache_key(
+    maze: str,
+    num_rows: int,
+    num_cols: int,
+    seed: int,
+    solver: Optional[str] = None
+) -> Optional[str]:
+    """ Content address of a generated maze, or of the maze after running a solver
+
+    Returns None when the algorithms' code cannot be versioned, such results are not cached
+    """
+    parts: List[Any] = [
+        FORMAT_VERSION,
+        # Mazes depend on the interpreter's random module as well as our own code
+        platform.python_implementation(),
+        list(sys.version_info[:2]),
+        maze, num_rows, num_cols, seed, code_version(MAZE[maze])
+    ]
+    if solver is not None:
+        parts += [solver, code_version(SOLVER[solver])]
+    if None in parts:
+        return None
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def encode_tiles(tile_states: List[List[int]]) -> bytes:
+    """ Pack a grid of TileState values into the on-disk format
+    """
+    height, width = len(tile_states), len(tile_states[0])
+    payload = zlib.compress(bytes(v for row in tile_states for v in row), 9)
+    return HEADER.pack(MAGIC, FORMAT_VERSION, height, width) + payload
+
+
+def decode_tiles(data: bytes) -> Optional[List[List[int]]]:
+    """ Unpack the on-disk format, returning None for anything malformed
+    """
+    try:
+        magic, version, height, width = HEADER.unpack_from(data)
+        flat = zlib.decompress(data[HEADER.size:])
+    except (struct.error, zlib.error):
+        return None
+    if magic != MAGIC or version != FORMAT_VERSION or len(flat) != height * width:
+        return None
+    return [list(flat[i * width:(i + 1) * width]) for i in range(height)]
+
+
+class MazeCache:
+    LOCK_NAME = ".lock"
+    # Fraction of max_bytes left after an eviction, so that eviction is not rerun on every store
+    LOW_WATER = 0.9
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """ A size capped LRU cache of tile grids shared between processes
+
+        Args:
+            directory: Cache directory, created on demand. Defaults to default_cache_dir()
+            max_bytes: Approximate size cap of all entries
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._warned = False
+
+    def _warn(self, action: str, error: OSError) -> None:
+        """ Log the first filesystem error only, the cache is best-effort
+        """
+        if not self._warned:
+            self._warned = True
+            logger.warning("Maze cache %s failed in %s, continuing without it: %s", action, self.directory, error)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + SUFFIX)
+
+    def load(self, key: str) -> Optional[List[List[int]]]:
+        """ Return the cached tile grid for key, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            # Mark as recently used, optional for read-only or concurrently evicted entries
+            os.utime(path)
+        except OSError:
+            pass
+        return decode_tiles(data)
+
+    def store(self, key: str, tile_states: List[List[int]]) -> None:
+        """ Atomically write the tile grid for key and evict old entries if needed
+        """
+        path = self._path(key)
+        data = encode_tiles(tile_states)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        except OSError as error:
+            self._warn("write", error)
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException as error:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            if not isinstance(error, OSError):
+                raise
+            self._warn("write", error)
+            return
+
+        try:
+            with self._locked_tally() as tally:
+                total = self._read_tally(tally)
+                if total is None or total + len(data) > self.max_bytes:
+                    # A missing tally, e.g. a directory from before tallies existed, is rebuilt by the scan
+                    total = self._evict()
+                else:
+                    total += len(data)
+                self._write_tally(tally, total)
+        except OSError as error:
+            self._warn("eviction", error)
+
+    @contextmanager
+    def _locked_tally(self) -> Iterator[BinaryIO]:
+        """ Open the lock file, which holds the running size tally, exclusively
+
+        Without fcntl (Windows) the tally is unlocked and only approximate
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, self.LOCK_NAME), "a+b") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield lock
+
+    @staticmethod
+    def _read_tally(tally: BinaryIO) -> Optional[int]:
+        tally.seek(0)
+        try:
+            return int(tally.read())
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _write_tally(tally: BinaryIO, total: int) -> None:
+        tally.seek(0)
+        tally.truncate()
+        tally.write(str(total).encode())
+        tally.flush()
+
+    def evict(self) -> None:
+        """ Remove least recently used entries until the cache fits in max_bytes
+        """
+        with self._locked_tally() as tally:
+            self._write_tally(tally, self._evict())
+
+    def _evict(self) -> int:
+        """ Rescan the cache with the lock held, evict down to LOW_WATER and return the new total
+
+        Temporary files abandoned by crashed writers are deleted along the way.
+        Overwritten entries are counted twice by the tally, a rescan corrects that
+        """
+        entries = []
+        total = 0
+        stale_before = time.time() - STALE_TMP_SECONDS
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                is_tmp = entry.name.endswith(".tmp")
+                if not (is_tmp or entry.name.endswith(SUFFIX)):
+                    continue
+                try:
+                    stat = entry.stat()
+                    if is_tmp and stat.st_mtime < stale_before:
+                        os.remove(entry.path)
+                        continue
+                except OSError:
+                    continue
+                total += stat.st_size
+                if not is_tmp:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        if total <= self.max_bytes:
+            return total
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes * self.LOW_WATER:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        return total
+
+
+def replay(
+    cache: Optional[MazeCache],
+    key: Optional[str],
+    maze_map: MazeMap,
+    steps: Iterator[bool]
+) -> Iterator[bool]:
+    """ Wrap generator or solver steps with the cache
+
+    On a hit the cached tiles are loaded into maze_map and steps is never advanced.
+    On a miss steps runs to completion and the final tiles are stored under key.
+    A key of None bypasses the cache
+    """
+    if key is None:
+        cache = None
+    tile_states = cache.load(key) if cache is not None else None
+    if tile_states is not None:
+        maze_map.load_tile_states(tile_states)
+        maze_map.draw()
+        yield True
+        return
+    yield from steps
+    if cache is not None:
+        cache.store(key, maze_map.tile_states())
@@ -1,10 +1,10 @@
-from typing import Optional, Dict, List, Any
-
-import pygame
-from pygame import Color
+from typing import Optional, Dict, List, Any, Tuple
 
 from enum import Enum
 
+# RGBA, accepted anywhere pygame expects a Color
+Color = Tuple[int, int, int, int]
+
 
 class TileState(Enum):
     FLOOR_STATE = 0
@@ -19,12 +19,12 @@ class MazeCell:
     TILE_HEIGHT = 3
     CELL_WIDTH = TILE_WIDTH * 3
     CELL_HEIGHT = TILE_HEIGHT * 3
-    WALL_COLOR: Color = Color(0,0,4,255)
-    FLOOR_COLOR: Color = Color(255,255,255,255)
-    SEARCH_COLOR: Color = Color(23,255,23,255)
-    PATH_COLOR: Color = Color(22, 22, 255, 255)
-    START_SEARCH_COLOR: Color = Color(255, 0, 255, 255)
-    END_SEARCH_COLOR: Color = Color(255, 255, 0, 255)
+    WALL_COLOR: Color = (0,0,4,255)
+    FLOOR_COLOR: Color = (255,255,255,255)
+    SEARCH_COLOR: Color = (23,255,23,255)
+    PATH_COLOR: Color = (22, 22, 255, 255)
+    START_SEARCH_COLOR: Color = (255, 0, 255, 255)
+    END_SEARCH_COLOR: Color = (255, 255, 0, 255)
 
     STATE_TO_COLOR: Dict[int, Color] = {
         TileState.FLOOR_STATE: FLOOR_COLOR,
@@ -59,6 +59,11 @@ class MazeCell:
         self.canvas = canvas
 
     def draw(self):
+        if self.canvas is None:
+            # Headless maze, nothing to render
+            return
+        # Deferred so that headless use never loads pygame
+        import pygame
         for i in range(len(self.tiles)):
             for j in range(len(self.tiles[0])):
                 current_color = MazeCell.STATE_TO_COLOR.get(self.tiles[i][j], MazeCell.FLOOR_COLOR)
@@ -12,6 +12,7 @@ from collections import deque
 from mazes.mazemap import MazeMap
 from mazes.mazecell import MazeCell, TileState
 from mazes.constants import DIRECTIONS
+from mazes.registry import MAZE  # re-exported, resolved lazily
 
 
 def generate_dfs_maze(maze_map: MazeMap, seed: int = 42) -> bool:
@@ -108,7 +109,7 @@ def generate_prims_maze(maze_map: MazeMap, seed:int = 42) -> bool:
         #if(mode):
         #    random_cell = cell_set.pop() #Note pop is not random
         #else:
-        random_cell = random.sample(cell_set,1)[0]
+        random_cell = random.sample(tuple(cell_set),1)[0]
         cell_set.remove(random_cell)
         cr, cc = random_cell
         # Visit the current cell
@@ -177,10 +178,3 @@ def generate_corridor_maze(maze_map: MazeMap, seed:int = 42) -> bool:
                 parent[(nr,nc)] = (cr,cc)
         
     yield True
-
-MAZE = {
-    "dfs": generate_dfs_maze,
-    "bfs": generate_bfs_maze,
-    "prims": generate_prims_maze,
-    "corridor": generate_corridor_maze
-}
\ No newline at end of file
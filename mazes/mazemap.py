@@ -1,10 +1,5 @@
-
-
-from lib2to3.pgen2 import driver
 from typing import Any, Dict, List, Optional
 
-import pygame
-from pygame import Color
 from mazes.mazecell import MazeCell, TileState
 
 class MazeMap:
@@ -39,6 +34,30 @@ class MazeMap:
                 self.cells[i][j].draw()
 
 
+    def tile_states(self) -> List[List[int]]:
+        """ Flatten the MazeMap into a (3*num_rows, 3*num_columns) grid of TileState values
+        """
+        return [
+            [cell.tiles[i][j].value for cell in row for j in range(3)]
+            for row in self.cells for i in range(3)
+        ]
+
+
+    def load_tile_states(self, tile_states: List[List[int]]) -> None:
+        """ Overwrite every tile from a grid produced by tile_states()
+        """
+        if len(tile_states) != 3 * self.num_rows or len(tile_states[0]) != 3 * self.num_columns:
+            raise ValueError(
+                f"Expected a {3*self.num_rows}x{3*self.num_columns} tile grid, "
+                f"got {len(tile_states)}x{len(tile_states[0])}"
+            )
+        for cell_row in self.cells:
+            for cell in cell_row:
+                for i in range(3):
+                    row = tile_states[3*cell.row + i]
+                    cell.tiles[i] = [TileState(row[3*cell.col + j]) for j in range(3)]
+
+
     def query_connected(self, a: MazeCell, b: Optional[MazeCell], query_state: int = TileState.SEARCH_STATE) -> bool:
         """ Determine if cells a and b are connected
         
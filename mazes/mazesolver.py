@@ -9,6 +9,7 @@ from typing import Tuple, Dict, Set, List, Any
 from mazes.mazemap import MazeMap
 from mazes.mazecell import MazeCell, TileState
 from mazes.constants import DIRECTIONS 
+from mazes.registry import SOLVER  # re-exported, resolved lazily
 
 
 
@@ -256,11 +257,3 @@ def double_bfs(maze_map: MazeMap, start: MazeCell, end: MazeCell) -> None:
             yield True
             prev = cur
         yield True
-
-
-SOLVER = {
-    "dfs": dfs,
-    "dijkstra": dijkstra,
-    "astar": astar,
-    "double_bfs": double_bfs
-}
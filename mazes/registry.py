@@ -0,0 +1,91 @@
+""" Lazily resolved registries of maze generators and path solvers
+
+Built-in algorithms are referenced by "module:attribute" strings and only imported
+on first lookup. Third-party packages can add their own under the "amaze.mazes"
+and "amaze.solvers" entry point groups, e.g. in pyproject.toml:
+
+    [project.entry-points."amaze.mazes"]
+    kruskal = "my_package.mazes:generate_kruskal_maze"
+"""
+from collections.abc import Mapping
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterator, List, Union
+
+
+def _entry_points(group: str) -> List[Any]:
+    from importlib.metadata import entry_points
+    try:
+        return list(entry_points(group=group))
+    except TypeError:  # Python < 3.10
+        return list(entry_points().get(group, []))
+
+
+class Registry(Mapping):
+
+    def __init__(self, group: str, builtins: Dict[str, str]) -> None:
+        """ A mapping of name -> callable, resolved on first access
+
+        Args:
+            group: Entry point group scanned for third-party additions
+            builtins: Built-in names mapped to "module:attribute" targets
+        """
+        self.group = group
+        self.builtins = list(builtins)
+        self._targets: Dict[str, Union[str, Any]] = dict(builtins)
+        self._resolved: Dict[str, Callable] = {}
+        self._scanned = False
+
+    def _scan(self) -> None:
+        """ Add installed entry points, built-ins take precedence on name clashes
+        """
+        if self._scanned:
+            return
+        self._scanned = True
+        for entry_point in _entry_points(self.group):
+            self._targets.setdefault(entry_point.name, entry_point)
+
+    def register(self, name: str, fn: Callable) -> None:
+        """ Add or replace an algorithm at runtime
+        """
+        self._targets[name] = fn
+        self._resolved[name] = fn
+
+    def __setitem__(self, name: str, fn: Callable) -> None:
+        """ Dict style registration, kept for callers of the old MAZE/SOLVER dicts
+        """
+        self.register(name, fn)
+
+    def __getitem__(self, name: str) -> Callable:
+        if name not in self._resolved:
+            if name not in self._targets:
+                self._scan()
+            target = self._targets[name]
+            if isinstance(target, str):
+                module, attr = target.split(":")
+                self._resolved[name] = getattr(import_module(module), attr)
+            else:
+                self._resolved[name] = target.load()
+        return self._resolved[name]
+
+    def __iter__(self) -> Iterator[str]:
+        self._scan()
+        return iter(self._targets)
+
+    def __len__(self) -> int:
+        self._scan()
+        return len(self._targets)
+
+
+MAZE = Registry("amaze.mazes", {
+    "dfs": "mazes.mazegen:generate_dfs_maze",
+    "bfs": "mazes.mazegen:generate_bfs_maze",
+    "prims": "mazes.mazegen:generate_prims_maze",
+    "corridor": "mazes.mazegen:generate_corridor_maze"
+})
+
+SOLVER = Registry("amaze.solvers", {
+    "dfs": "mazes.mazesolver:dfs",
+    "dijkstra": "mazes.mazesolver:dijkstra",
+    "astar": "mazes.mazesolver:astar",
+    "double_bfs": "mazes.mazesolver:double_bfs"
+})
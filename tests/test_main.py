@@ -0,0 +1,38 @@
+import json
+
+from click.testing import CliRunner
+import pytest
+
+from main import main
+
+
+def _analyze(*args):
+    return CliRunner().invoke(main, ["--no_cache", *args])
+
+
+def test_analyze_prints_one_json_object_per_maze():
+    result = _analyze("-m", "dfs", "-r", "4", "-c", "5", "--seed", "7", "analyze", "-n", "3", "--batch_size", "2")
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert [r["seed"] for r in records] == [7, 8, 9]
+    assert all(r["maze"] == "dfs" and r["num_rows"] == 4 and r["num_cols"] == 5 for r in records)
+    assert all(r["is_perfect"] for r in records)
+
+
+def test_analyze_endpoints():
+    corner = _analyze("-m", "dfs", "-r", "4", "-c", "4", "analyze", "--start", "0", "0", "--end", "0", "0")
+    assert json.loads(corner.output)["solution_length"] == 0
+
+
+@pytest.mark.parametrize("args,option", [
+    (["-m", "nope", "analyze"], "--maze"),
+    (["-s", "nope"], "--solver"),
+    (["-r", "0", "analyze"], "--num_rows"),
+    (["analyze", "--batch_size", "0"], "--batch_size"),
+    (["-r", "3", "analyze", "--end", "3", "0"], "--end"),
+])
+def test_bad_input_is_a_usage_error(args, option):
+    result = _analyze(*args)
+    assert result.exit_code == 2
+    assert option in result.output
+    assert "Traceback" not in result.output
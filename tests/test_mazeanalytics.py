@@ -0,0 +1,124 @@
+from collections import deque
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pytest
+
+from mazes.mazeanalytics import analyze_walls, stats_to_records, walls_from_maze_maps
+from mazes.mazegen import generate_dfs_maze, generate_prims_maze
+from mazes.mazemap import MazeMap
+
+
+def _adjacency(east: np.ndarray, south: np.ndarray) -> Dict[Tuple[int, int], List[Tuple[int, int]]]:
+    rows, cols = east.shape[0], east.shape[1] + 1
+    adj = {(r, c): [] for r in range(rows) for c in range(cols)}
+    for r in range(rows):
+        for c in range(cols - 1):
+            if east[r, c]:
+                adj[(r, c)].append((r, c + 1))
+                adj[(r, c + 1)].append((r, c))
+    for r in range(rows - 1):
+        for c in range(cols):
+            if south[r, c]:
+                adj[(r, c)].append((r + 1, c))
+                adj[(r + 1, c)].append((r, c))
+    return adj
+
+
+def _bfs(adj, source) -> Dict[Tuple[int, int], int]:
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        cell = queue.popleft()
+        for neighbor in adj[cell]:
+            if neighbor not in dist:
+                dist[neighbor] = dist[cell] + 1
+                queue.append(neighbor)
+    return dist
+
+
+def _reference(east: np.ndarray, south: np.ndarray, start, end) -> Dict:
+    """ Naive per-maze metrics with plain Python graph searches
+    """
+    rows, cols = east.shape[0], east.shape[1] + 1
+    adj = _adjacency(east, south)
+    start = (start[0] % rows, start[1] % cols)
+    end = (end[0] % rows, end[1] % cols)
+
+    seen = set()
+    num_components = 0
+    for cell in adj:
+        if cell not in seen:
+            num_components += 1
+            seen |= set(_bfs(adj, cell))
+    num_passages = int(east.sum() + south.sum())
+
+    corridor = {cell for cell, nbrs in adj.items() if len(nbrs) == 2}
+    histogram = [0]
+    seen = set()
+    for cell in corridor:
+        if cell in seen:
+            continue
+        run, stack = 0, [cell]
+        seen.add(cell)
+        while stack:
+            current = stack.pop()
+            run += 1
+            for neighbor in adj[current]:
+                if neighbor in corridor and neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        histogram += [0] * (run + 1 - len(histogram))
+        histogram[run] += 1
+
+    from_start = _bfs(adj, start)
+    return {
+        "is_connected": num_components == 1,
+        "is_acyclic": num_passages == rows * cols - num_components,
+        "num_components": num_components,
+        "dead_ends": sum(len(n) == 1 for n in adj.values()),
+        "junctions": sum(len(n) >= 3 for n in adj.values()),
+        "corridor_histogram": histogram,
+        "solution_length": from_start.get(end, -1),
+        # Exhaustive eccentricity over the reachable region
+        "diameter": max(max(_bfs(adj, cell).values()) for cell in from_start),
+    }
+
+
+@pytest.mark.parametrize("rows,cols", [(1, 1), (1, 7), (7, 1), (2, 2), (5, 6), (8, 3)])
+@pytest.mark.parametrize("density", [0.3, 0.6, 0.9])
+def test_random_walls_match_reference(rows, cols, density):
+    rng = np.random.default_rng(rows * 100 + cols + int(density * 10))
+    batch = 6
+    east = rng.random((batch, rows, cols - 1)) < density
+    south = rng.random((batch, rows - 1, cols)) < density
+    start, end = (0, -1), (-1, 0)
+    records = stats_to_records(analyze_walls(east, south, start, end))
+    for i, record in enumerate(records):
+        expected = _reference(east[i], south[i], start, end)
+        if not expected["is_acyclic"]:
+            # Two distance fields only bound the diameter of a cyclic maze from below
+            assert record.pop("diameter") <= expected.pop("diameter")
+        for key, value in expected.items():
+            assert record[key] == value, (i, key)
+        assert record["is_perfect"] == (expected["is_connected"] and expected["is_acyclic"])
+
+
+def test_generated_mazes_are_perfect():
+    maze_maps = []
+    for seed, generate in enumerate([generate_dfs_maze, generate_prims_maze] * 3):
+        maze_map = MazeMap(6, 9, None)
+        deque(generate(maze_map, seed), maxlen=0)
+        maze_maps.append(maze_map)
+    east, south = walls_from_maze_maps(maze_maps)
+    records = stats_to_records(analyze_walls(east, south))
+    for i, record in enumerate(records):
+        assert record["is_perfect"]
+        expected = _reference(east[i], south[i], (0, 0), (-1, -1))
+        for key, value in expected.items():
+            assert record[key] == value, (i, key)
+
+
+def test_mismatched_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        walls_from_maze_maps([MazeMap(2, 3, None), MazeMap(3, 2, None)])
@@ -0,0 +1,158 @@
+from collections import deque
+from multiprocessing import Pool
+import os
+import sys
+import time
+
+import pytest
+
+from mazes import mazecache
+from mazes.mazecache import MazeCache, cache_key, code_version, decode_tiles, encode_tiles, replay
+from mazes.mazegen import generate_dfs_maze
+from mazes.mazemap import MazeMap
+from mazes.registry import Registry
+
+
+@pytest.fixture
+def tile_states():
+    maze_map = MazeMap(6, 7, None)
+    deque(generate_dfs_maze(maze_map, 3), maxlen=0)
+    return maze_map.tile_states()
+
+
+def _entry_paths(directory):
+    return [
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory) for name in names
+        if name.endswith(mazecache.SUFFIX)
+    ]
+
+
+def test_encode_decode_round_trip(tile_states):
+    data = encode_tiles(tile_states)
+    assert len(data) < len(tile_states) * len(tile_states[0])
+    assert decode_tiles(data) == tile_states
+
+
+@pytest.mark.parametrize("data", [b"", b"AMZC", b"XXXX" + b"\0" * 20, encode_tiles([[1, 2]])[:-3]])
+def test_decode_rejects_malformed_data(data):
+    assert decode_tiles(data) is None
+
+
+def test_store_then_load(tmp_path, tile_states):
+    cache = MazeCache(str(tmp_path))
+    key = cache_key("dfs", 6, 7, 3)
+    assert cache.load(key) is None
+    cache.store(key, tile_states)
+    assert cache.load(key) == tile_states
+
+
+def test_replay_restores_maze(tmp_path, tile_states):
+    cache = MazeCache(str(tmp_path))
+    key = cache_key("dfs", 6, 7, 3)
+    cache.store(key, tile_states)
+    maze_map = MazeMap(6, 7, None)
+    steps = replay(cache, key, maze_map, generate_dfs_maze(maze_map, 99))
+    deque(steps, maxlen=0)
+    assert maze_map.tile_states() == tile_states
+
+
+def test_keys_depend_on_every_parameter():
+    keys = {
+        cache_key("dfs", 6, 7, 3),
+        cache_key("prims", 6, 7, 3),
+        cache_key("dfs", 7, 6, 3),
+        cache_key("dfs", 6, 7, 4),
+        cache_key("dfs", 6, 7, 3, "astar"),
+    }
+    assert len(keys) == 5
+
+
+def test_keys_depend_on_the_interpreter(monkeypatch):
+    key = cache_key("dfs", 6, 7, 3)
+    monkeypatch.setattr(sys, "version_info", (2, 7, 18))
+    assert cache_key("dfs", 6, 7, 3) != key
+
+
+def test_unversionable_algorithms_are_not_cached(monkeypatch):
+    namespace = {}
+    exec("def generate(maze_map, seed):\n    yield True", namespace)
+    assert code_version(namespace["generate"]) is None
+    registry = Registry("amaze.test", {})
+    registry.register("repl_maze", namespace["generate"])
+    monkeypatch.setattr(mazecache, "MAZE", registry)
+    assert cache_key("repl_maze", 2, 2, 0) is None
+
+
+def test_load_survives_failed_mtime_refresh(tmp_path, tile_states, monkeypatch):
+    cache = MazeCache(str(tmp_path))
+    cache.store("ab" * 32, tile_states)
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("read-only cache")
+    monkeypatch.setattr(os, "utime", read_only)
+    assert cache.load("ab" * 32) == tile_states
+
+
+def test_store_failures_are_not_fatal(tmp_path, tile_states):
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    cache = MazeCache(str(blocker / "cache"))
+    cache.store("ab" * 32, tile_states)
+    cache.store("cd" * 32, tile_states)
+    assert cache.load("ab" * 32) is None
+
+
+def test_evict_removes_least_recently_used(tmp_path, tile_states):
+    cache = MazeCache(str(tmp_path))
+    keys = [f"{i:064x}" for i in range(10)]
+    for i, key in enumerate(keys):
+        cache.store(key, tile_states)
+        os.utime(cache._path(key), (1000 + i, 1000 + i))
+    # Reading an old entry makes it the most recently used
+    assert cache.load(keys[0]) is not None
+    entry_size = os.path.getsize(cache._path(keys[0]))
+    cache.max_bytes = 5 * entry_size
+    cache.evict()
+
+    remaining = set(_entry_paths(tmp_path))
+    assert sum(os.path.getsize(p) for p in remaining) <= cache.max_bytes * cache.LOW_WATER
+    assert cache._path(keys[0]) in remaining
+    assert cache._path(keys[-1]) in remaining
+    assert cache._path(keys[1]) not in remaining
+
+
+def test_evict_deletes_stale_temporary_files(tmp_path, tile_states):
+    cache = MazeCache(str(tmp_path))
+    cache.store("ab" * 32, tile_states)
+    stale = tmp_path / "ab" / "crashed.tmp"
+    fresh = tmp_path / "ab" / "in_flight.tmp"
+    stale.write_bytes(b"x" * 100)
+    fresh.write_bytes(b"x" * 100)
+    old = time.time() - 2 * mazecache.STALE_TMP_SECONDS
+    os.utime(stale, (old, old))
+    cache.evict()
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_cap_holds_across_short_lived_instances(tmp_path, tile_states):
+    entry_size = len(encode_tiles(tile_states))
+    max_bytes = 3 * entry_size
+    for i in range(10):
+        MazeCache(str(tmp_path), max_bytes=max_bytes).store(f"{i:064x}", tile_states)
+        assert sum(os.path.getsize(p) for p in _entry_paths(tmp_path)) <= max_bytes
+    remaining = _entry_paths(tmp_path)
+    assert MazeCache(str(tmp_path))._path(f"{9:064x}") in remaining
+
+
+def _store_one(args):
+    directory, max_bytes, i, tile_states = args
+    MazeCache(directory, max_bytes=max_bytes).store(f"{i:064x}", tile_states)
+
+
+def test_cap_holds_across_processes(tmp_path, tile_states):
+    max_bytes = 5 * len(encode_tiles(tile_states))
+    with Pool(4) as pool:
+        pool.map(_store_one, [(str(tmp_path), max_bytes, i, tile_states) for i in range(40)])
+    assert sum(os.path.getsize(p) for p in _entry_paths(tmp_path)) <= max_bytes
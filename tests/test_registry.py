@@ -0,0 +1,81 @@
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from mazes import mazegen, registry
+from mazes.registry import MAZE, Registry
+
+
+class FakeEntryPoint(SimpleNamespace):
+    def load(self):
+        self.loads += 1
+        return self.target
+
+
+@pytest.fixture
+def plugins(monkeypatch):
+    entry_points = {
+        "amaze.test": [
+            FakeEntryPoint(name="plugin", target=mazegen.generate_prims_maze, loads=0),
+            FakeEntryPoint(name="dfs", target=mazegen.generate_prims_maze, loads=0),
+        ]
+    }
+    scans = []
+
+    def fake_entry_points(group):
+        scans.append(group)
+        return entry_points.get(group, [])
+    monkeypatch.setattr(registry, "_entry_points", fake_entry_points)
+    return entry_points["amaze.test"], scans
+
+
+def test_builtins_resolve_lazily():
+    reg = Registry("amaze.test", {"dfs": "mazes.mazegen:generate_dfs_maze"})
+    assert reg._resolved == {}
+    assert reg["dfs"] is mazegen.generate_dfs_maze
+    assert MAZE["prims"] is mazegen.generate_prims_maze
+
+
+def test_entry_points_are_scanned_only_when_needed(plugins):
+    entry_points, scans = plugins
+    reg = Registry("amaze.test", {"dfs": "mazes.mazegen:generate_dfs_maze"})
+    reg["dfs"]
+    assert scans == []
+    assert reg["plugin"] is mazegen.generate_prims_maze
+    assert reg["plugin"] is mazegen.generate_prims_maze
+    assert scans == ["amaze.test"]
+    assert entry_points[0].loads == 1
+
+
+def test_builtins_win_name_clashes(plugins):
+    reg = Registry("amaze.test", {"dfs": "mazes.mazegen:generate_dfs_maze"})
+    assert list(reg) == ["dfs", "plugin"]
+    assert reg["dfs"] is mazegen.generate_dfs_maze
+
+
+def test_unknown_names_raise_key_error(plugins):
+    reg = Registry("amaze.test", {})
+    with pytest.raises(KeyError):
+        reg["nope"]
+    assert "nope" not in reg
+
+
+def test_register_and_dict_style_assignment(plugins):
+    reg = Registry("amaze.test", {})
+    reg.register("mine", mazegen.generate_dfs_maze)
+    reg["other"] = mazegen.generate_corridor_maze
+    assert reg["mine"] is mazegen.generate_dfs_maze
+    assert reg["other"] is mazegen.generate_corridor_maze
+    assert {"mine", "other"} <= set(reg)
+
+
+def test_core_modules_import_without_pygame_or_lib2to3():
+    code = (
+        "import sys\n"
+        "import mazes.mazegen, mazes.mazesolver, mazes.mazemap, mazes.mazecell, mazes.mazecache\n"
+        "print(sorted(m for m in ('pygame', 'lib2to3', 'numpy') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"